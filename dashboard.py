@@ -1,9 +1,19 @@
 import streamlit as st
 import pandas as pd
 import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
 import plotly.express as px
 from PIL import Image # Import Pillow for image handling
 import os # Importar os para leer variables de entorno
+from concurrent.futures import ThreadPoolExecutor
+
+# connectorx es opcional: decodifica los resultados en Rust directamente a
+# buffers columnares de Arrow, evitando el objeto de Python por valor de la
+# ruta psycopg2 + pd.read_sql_query en lecturas masivas.
+try:
+    import connectorx as cx
+except ImportError:
+    cx = None
 
 # --- PARÁMETROS DE CONEXIÓN A SQL ---
 DB_NAME = os.environ.get('DB_NAME', 'tu_basededatos')
@@ -20,12 +30,15 @@ CONN_PARAMS = {
     'port': DB_PORT
 }
 
-# --- Cache para la conexión a la base de datos ---
-@st.cache_resource # Usar cache_resource para conexiones
-def init_connection():
+# --- Cache para el pool de conexiones a la base de datos ---
+@st.cache_resource # Usar cache_resource para recursos compartidos entre sesiones
+def init_connection_pool():
     """
-    Inicializa la conexión a la base de datos SQL.
-    Retorna el objeto de conexión.
+    Inicializa un pool de conexiones a la base de datos SQL, compartido por
+    todo el proceso. Cada consulta toma una conexión del pool y la devuelve
+    al terminar, así varios usuarios concurrentes no se serializan sobre un
+    único socket ni pagan el handshake de conexión en cada sesión.
+    Retorna el objeto ThreadedConnectionPool.
     """
     # Verificar si las variables de entorno esenciales están configuradas
     # (especialmente en un entorno de producción)
@@ -40,8 +53,7 @@ def init_connection():
         )
 
     try:
-        conn = psycopg2.connect(**CONN_PARAMS)
-        return conn
+        return ThreadedConnectionPool(minconn=1, maxconn=16, **CONN_PARAMS)
     except psycopg2.OperationalError as e:
         st.error(f"Error al conectar con SQL: {e}")
         st.error(
@@ -54,37 +66,190 @@ def init_connection():
         st.error(f"Un error inesperado ocurrió durante la conexión: {e}")
         st.stop()
 
+def _release_conn(pool, conn):
+    """
+    Devuelve una conexión al pool tras cerrar su transacción de solo lectura.
+    Si la conexión murió (reinicio del servidor, timeout de inactividad), el
+    rollback falla: en ese caso la conexión se descarta con close=True para
+    que el pool no quede con el slot ocupado para siempre.
+    """
+    try:
+        conn.rollback()
+    except Exception:
+        pool.putconn(conn, close=True)
+        return
+    pool.putconn(conn)
+
 # --- Cache para la carga de datos ---
-@st.cache_data(ttl=600) # Cachea los datos por 10 minutos
-def run_query(_conn, query, params=None):
+# Dos niveles de TTL: las consultas que dependen de la entrada del usuario se
+# cachean 10 minutos, mientras que los agregados estáticos del análisis se
+# cachean 24 horas (los datos de Netflix casi no cambian). El botón
+# "Refrescar datos" de la barra lateral invalida todo explícitamente.
+SHORT_TTL = 600    # 10 minutos
+LONG_TTL = 86400   # 24 horas
+
+@st.cache_data(ttl=SHORT_TTL)
+def run_query(_pool, query, params=None, dtype_backend=None):
     """
-    Ejecuta una consulta SQL y retorna los resultados como un DataFrame de Pandas.
+    Ejecuta una consulta SQL usando una conexión del pool y retorna los
+    resultados como un DataFrame de Pandas.
     Args:
-        _conn: Objeto de conexión a la base de datos.
+        _pool: Pool de conexiones a la base de datos.
         query (str): Consulta SQL a ejecutar.
         params (tuple, optional): Parámetros para la consulta SQL.
+        dtype_backend (str, optional): Backend de dtypes para pandas; usar
+            "pyarrow" en resultados con mucho texto, donde las columnas
+            columnares de Arrow ocupan mucho menos que los objetos de Python.
     """
+    conn = _pool.getconn()
     try:
-        return pd.read_sql_query(query, _conn, params=params)
+        kwargs = {'dtype_backend': dtype_backend} if dtype_backend else {}
+        return pd.read_sql_query(query, conn, params=params, **kwargs)
     except Exception as e:
         st.error(f"Error al ejecutar la consulta: {query}")
         st.error(f"Detalles del error: {e}")
         return pd.DataFrame() # Retorna un DataFrame vacío en caso de error
+    finally:
+        _release_conn(_pool, conn) # Cierra la transacción de solo lectura antes de devolver la conexión
+
+def _run_query_pooled_rows(pool, query, params=None, fallback=None):
+    """
+    Ejecuta una consulta desde un hilo de trabajo y retorna las filas crudas
+    del cursor (lista de tuplas), sin construir un DataFrame: para resultados
+    agregados de unas pocas decenas de filas que van directo a Plotly, el
+    DataFrame solo añade inferencia de dtypes e índice que nadie usa.
+    No llama a funciones de Streamlit y propaga las excepciones al hilo
+    principal a través del future. Si `fallback` se indica y la consulta
+    principal falla (por ejemplo, una vista materializada que aún no fue
+    creada), se reintenta una vez con la consulta de respaldo.
+    """
+    conn = pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            try:
+                cur.execute(query, params)
+            except Exception:
+                if fallback is None:
+                    raise
+                conn.rollback()
+                cur.execute(fallback, params)
+            return cur.fetchall()
+    finally:
+        _release_conn(pool, conn)
+
+@st.cache_data(ttl=LONG_TTL, persist="disk")
+def run_query_long_ttl(_pool, query, params=None):
+    """
+    Igual que run_query pero con TTL de 24 horas y persistencia en disco,
+    para consultas sobre datos casi estáticos cuyo resultado no depende de
+    la entrada del usuario: tras un reinicio o redeploy la app rehidrata
+    estos resultados desde el disco en lugar de volver a consultar la base.
+    A diferencia de run_query, los errores se propagan al llamador: si se
+    devolviera un DataFrame vacío, st.cache_data cachearía y persistiría el
+    fallo transitorio durante 24 horas.
+    """
+    conn = _pool.getconn()
+    try:
+        return pd.read_sql_query(query, conn, params=params)
+    finally:
+        _release_conn(_pool, conn)
+
+@st.cache_data(ttl=SHORT_TTL)
+def _run_query_connectorx(query):
+    """
+    Ejecuta una consulta vía connectorx, que escribe el resultado en buffers
+    de Arrow sin pasar por listas de objetos de Python.
+    """
+    uri = (f"postgresql://{CONN_PARAMS['user']}:{CONN_PARAMS['password']}"
+           f"@{CONN_PARAMS['host']}:{CONN_PARAMS['port']}/{CONN_PARAMS['dbname']}")
+    return cx.read_sql(uri, query, return_type="pandas")
+
+def run_bulk_query(pool, query):
+    """
+    Lectura masiva de filas (páginas de tablas completas): usa connectorx
+    si está instalado, con la ruta psycopg2 de run_query como respaldo.
+    """
+    if cx is not None:
+        try:
+            return _run_query_connectorx(query)
+        except Exception:
+            pass # recurrir a la ruta psycopg2
+    return run_query(pool, query)
+
+@st.cache_data(ttl=SHORT_TTL)
+def run_year_count_query(_pool, year):
+    """
+    Cuenta los shows añadidos en un año usando una sentencia preparada:
+    PostgreSQL analiza y planifica la consulta una sola vez por conexión
+    y los clics siguientes solo pagan el EXECUTE. El índice sobre
+    year_added (ver sql/indexes.sql) permite resolverla por índice.
+    Args:
+        _pool: Pool de conexiones a la base de datos.
+        year (int): Año a consultar.
+    """
+    conn = _pool.getconn()
+    try:
+        with conn.cursor() as cur:
+            try:
+                cur.execute(
+                    "PREPARE p_year_count (int) AS "
+                    "SELECT type, COUNT(*) AS count FROM shows WHERE year_added = $1 GROUP BY type;"
+                )
+                conn.commit()
+            except psycopg2.errors.DuplicatePreparedStatement:
+                conn.rollback() # esta conexión del pool ya tiene el plan preparado
+        return pd.read_sql_query("EXECUTE p_year_count(%s);", conn, params=(year,))
+    except Exception as e:
+        st.error(f"Error al consultar los shows añadidos en {year}.")
+        st.error(f"Detalles del error: {e}")
+        return pd.DataFrame()
+    finally:
+        _release_conn(_pool, conn)
+
+@st.cache_data(ttl=LONG_TTL, persist="disk")
+def run_analysis_queries(_pool, queries):
+    """
+    Ejecuta en paralelo un conjunto de consultas independientes de solo
+    lectura, cada una con su propia conexión del pool. Como psycopg2 libera
+    el GIL durante la E/S de red, el tiempo total baja de la suma de las
+    consultas a aproximadamente la más lenta. Los resultados (unas decenas
+    de filas) se persisten en disco para sobrevivir reinicios del proceso.
+    Si alguna consulta falla, la excepción se propaga al llamador para que
+    st.cache_data no cachee (ni persista durante 24 horas) un resultado
+    incompleto por un fallo transitorio de la base.
+    Args:
+        _pool: Pool de conexiones a la base de datos.
+        queries (dict): Mapa de nombre -> (consulta SQL, consulta de respaldo).
+    Retorna un dict de nombre -> lista de filas (tuplas) del cursor.
+    """
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {name: executor.submit(_run_query_pooled_rows, _pool, sql, None, fallback)
+                   for name, (sql, fallback) in queries.items()}
+        return {name: future.result() for name, future in futures.items()}
 
 # --- Configuración de la página de Streamlit ---
 st.set_page_config(page_title="Netflix Data Explorer", layout="wide")
 st.title("🎬 Explorador de Datos de Netflix")
 
 # --- Inicializar conexión ---
-conn = init_connection()
+pool = init_connection_pool()
 
 # --- Barra lateral para navegación y filtros ---
 st.sidebar.header("Navegación")
 
 # --- Añadir el logo a la barra lateral ---
+@st.cache_resource
+def load_logo():
+    """
+    Carga y decodifica el logo una sola vez por proceso: sin la caché,
+    Pillow reabría y decodificaba el PNG en cada rerun de Streamlit
+    (cada interacción con un widget).
+    """
+    return Image.open("NetflixLogo.png")
+
 try:
     # Intenta cargar la imagen. Asegúrate que 'NetflixLogo.png' esté en el mismo directorio.
-    logo = Image.open("NetflixLogo.png")
+    logo = load_logo()
     st.sidebar.image(logo, use_container_width=True)
 except FileNotFoundError:
     st.sidebar.warning("Logo 'NetflixLogo.png' no encontrado. Colócalo en el directorio del script.")
@@ -97,6 +262,10 @@ option = st.sidebar.selectbox(
     ("Inicio", "Ver Tablas Completas", "Análisis de Shows", "Buscar Shows por Título")
 )
 
+# Invalidación explícita: ante una carga de datos nueva, el usuario puede
+# vaciar la caché sin esperar a que expire el TTL de 24 horas.
+st.sidebar.button("🔄 Refrescar datos", on_click=st.cache_data.clear)
+
 # --- Lógica de las diferentes vistas ---
 
 if option == "Inicio":
@@ -115,15 +284,22 @@ if option == "Inicio":
     st.markdown("---") # Separador visual
     st.subheader("Consulta Rápida: Shows Añadidos por Año")
 
-    min_year_query = "SELECT MIN(year_added) FROM shows WHERE year_added IS NOT NULL;"
-    max_year_query = "SELECT MAX(year_added) FROM shows WHERE year_added IS NOT NULL;"
-    
-    df_min_year = run_query(conn, min_year_query)
-    df_max_year = run_query(conn, max_year_query)
+    # MIN y MAX en una sola consulta: un solo viaje a la base de datos y un
+    # solo DataFrame para dos escalares que casi no cambian (TTL de 24 horas).
+    # Los límites se guardan además en session_state: los reruns siguientes
+    # (cada interacción con un widget) ni siquiera consultan la caché.
+    if 'year_bounds' not in st.session_state:
+        year_bounds_query = "SELECT MIN(year_added) AS mn, MAX(year_added) AS mx FROM shows WHERE year_added IS NOT NULL;"
+        try:
+            st.session_state.year_bounds = run_query_long_ttl(pool, year_bounds_query)
+        except Exception as e:
+            # No guardar el fallo en session_state: el próximo rerun reintenta.
+            st.error(f"Error al consultar los límites de año: {e}")
+    df_year_bounds = st.session_state.get('year_bounds', pd.DataFrame())
 
     current_year = pd.Timestamp.now().year
-    min_val = int(df_min_year.iloc[0,0]) if not df_min_year.empty and pd.notna(df_min_year.iloc[0,0]) else 1900
-    max_val = int(df_max_year.iloc[0,0]) if not df_max_year.empty and pd.notna(df_max_year.iloc[0,0]) else current_year
+    min_val = int(df_year_bounds.iloc[0]['mn']) if not df_year_bounds.empty and pd.notna(df_year_bounds.iloc[0]['mn']) else 1900
+    max_val = int(df_year_bounds.iloc[0]['mx']) if not df_year_bounds.empty and pd.notna(df_year_bounds.iloc[0]['mx']) else current_year
 
     year_input = st.number_input(
         "Ingresa un año para ver cuántos títulos fueron añadidos:",
@@ -136,20 +312,15 @@ if option == "Inicio":
 
     if st.button("Consultar Shows Añadidos en el Año"):
         if year_input:
-            query_year_added = """
-                SELECT type, COUNT(*) as count
-                FROM shows
-                WHERE year_added = %s
-                GROUP BY type;
-            """
-            df_year_results = run_query(conn, query_year_added, params=(int(year_input),))
+            df_year_results = run_year_count_query(pool, int(year_input))
 
             if not df_year_results.empty:
-                message = f"En el año {year_input} se añadieron:\n"
-                for _, row in df_year_results.iterrows():
-                    tipo = "Películas" if row['type'] == 'Movie' else "Series de TV" if row['type'] == 'TV Show' else row['type']
-                    message += f"- {row['count']} {tipo}\n"
-                st.success(message)
+                # zip sobre las columnas en lugar de iterrows: evita construir
+                # una Series de Python por fila
+                tipo_map = {'Movie': 'Películas', 'TV Show': 'Series de TV'}
+                lines = [f"- {count} {tipo_map.get(tipo, tipo)}"
+                         for tipo, count in zip(df_year_results['type'], df_year_results['count'])]
+                st.success(f"En el año {year_input} se añadieron:\n" + "\n".join(lines))
             else:
                 st.info(f"No se encontraron títulos añadidos en el año {year_input}.")
         else:
@@ -175,171 +346,251 @@ elif option == "Ver Tablas Completas":
     if selected_table_display_name:
         db_table_name = table_names[selected_table_display_name]
         st.subheader(f"Contenido de la tabla: {db_table_name}")
-        
-        query = f"SELECT * FROM {db_table_name};"
-        df_table = run_query(conn, query)
-        
-        if not df_table.empty:
-            st.dataframe(df_table, use_container_width=True)
-            st.write(f"Total de filas: {len(df_table)}")
+
+        # Paginación en el servidor con LIMIT/OFFSET: solo se descarga una página
+        # por vez, así la memoria pico es O(tamaño de página) y no O(N filas)
+        # incluso para las tablas de relación grandes.
+        df_count = run_query(pool, f"SELECT COUNT(*) AS total FROM {db_table_name};")
+        total_rows = int(df_count.iloc[0]['total']) if not df_count.empty else 0
+
+        if total_rows > 0:
+            col_size, col_page = st.columns(2)
+            with col_size:
+                page_size = int(st.number_input("Filas por página:", min_value=100, max_value=10000,
+                                                value=1000, step=100))
+            total_pages = (total_rows + page_size - 1) // page_size
+            with col_page:
+                page = int(st.number_input(f"Página (de {total_pages}):", min_value=1,
+                                           max_value=total_pages, value=1, step=1))
+
+            # Valores interpolados directamente (connectorx no admite parámetros):
+            # el nombre de tabla sale del dict fijo de arriba y los límites son enteros.
+            query = f"SELECT * FROM {db_table_name} LIMIT {page_size} OFFSET {(page - 1) * page_size};"
+            df_table = run_bulk_query(pool, query)
+
+            if not df_table.empty:
+                st.dataframe(df_table, use_container_width=True)
+                first_row = (page - 1) * page_size + 1
+                last_row = min(page * page_size, total_rows)
+                st.write(f"Mostrando filas {first_row} a {last_row} de {total_rows}")
+            else:
+                st.warning(f"No se pudieron cargar datos de la tabla '{db_table_name}'.")
         else:
             st.warning(f"No se encontraron datos o la tabla '{db_table_name}' está vacía.")
 
 elif option == "Análisis de Shows":
     st.header("Análisis Detallado de Shows")
     
-    # Cargar datos necesarios para los análisis
-    query_shows = "SELECT show_id, type, title, director_id, release_year, rating, duration, month_added FROM shows;"
-    df_shows = run_query(conn, query_shows)
-
-    query_directors = "SELECT director_id, director_name FROM directors;"
-    df_directors = run_query(conn, query_directors)
-
-    query_show_cast = "SELECT show_id, cast_member_id FROM show_cast_members;"
-    df_show_cast = run_query(conn, query_show_cast)
-    query_cast_members = "SELECT cast_member_id, cast_member_name FROM cast_members;"
-    df_cast_members = run_query(conn, query_cast_members)
-
-    query_show_countries = "SELECT show_id, country_id FROM show_countries;"
-    df_show_countries = run_query(conn, query_show_countries)
-    query_countries = "SELECT country_id, country_name FROM countries;"
-    df_countries = run_query(conn, query_countries)
+    # Cargar datos necesarios para los análisis.
+    # Cada gráfico lee su vista materializada (ver sql/analytics_views.sql),
+    # refrescada cada noche, por lo que una expiración de caché solo cuesta
+    # 10-30 filas por consulta. Si las vistas aún no fueron creadas, se usa la
+    # consulta agregada equivalente sobre las tablas base como respaldo. Como
+    # son consultas independientes, se lanzan en paralelo y los gráficos se
+    # renderizan después en orden fijo.
+    analysis_queries = {
+        'type_counts': (
+            "SELECT * FROM mv_type_counts;",
+            "SELECT type, COUNT(*) AS count FROM shows GROUP BY type;",
+        ),
+        'release_year_counts': (
+            "SELECT * FROM mv_release_year_counts;",
+            """
+            SELECT release_year, COUNT(*) AS count
+            FROM shows
+            WHERE release_year IS NOT NULL
+            GROUP BY release_year
+            ORDER BY release_year DESC
+            LIMIT 30;
+            """,
+        ),
+        'rating_counts': (
+            "SELECT * FROM mv_rating_counts ORDER BY count DESC;",
+            """
+            SELECT rating, COUNT(*) AS count
+            FROM shows
+            WHERE rating IS NOT NULL
+            GROUP BY rating
+            ORDER BY count DESC
+            LIMIT 10;
+            """,
+        ),
+        'month_counts': (
+            "SELECT * FROM mv_month_counts;",
+            """
+            SELECT month_added, COUNT(*) AS count
+            FROM shows
+            WHERE month_added IS NOT NULL
+            GROUP BY month_added;
+            """,
+        ),
+        'top_directors': (
+            "SELECT * FROM mv_top_directors ORDER BY count DESC;",
+            """
+            SELECT d.director_name, COUNT(*) AS count
+            FROM shows s
+            JOIN directors d USING (director_id)
+            WHERE lower(d.director_name) <> 'unknown'
+            GROUP BY d.director_name
+            ORDER BY count DESC
+            LIMIT 10;
+            """,
+        ),
+        'top_cast': (
+            "SELECT * FROM mv_top_cast ORDER BY count DESC;",
+            """
+            SELECT cm.cast_member_name, COUNT(*) AS count
+            FROM show_cast_members scm
+            JOIN cast_members cm USING (cast_member_id)
+            GROUP BY cm.cast_member_name
+            ORDER BY count DESC
+            LIMIT 10;
+            """,
+        ),
+        'top_countries': (
+            "SELECT * FROM mv_top_countries ORDER BY count DESC;",
+            """
+            SELECT c.country_name, COUNT(*) AS count
+            FROM show_countries sc
+            JOIN countries c USING (country_id)
+            GROUP BY c.country_name
+            ORDER BY count DESC
+            LIMIT 10;
+            """,
+        ),
+        'top_genres': (
+            "SELECT * FROM mv_top_genres ORDER BY count DESC;",
+            """
+            SELECT g.genre_name, COUNT(*) AS count
+            FROM show_genres sg
+            JOIN genres g USING (genre_id)
+            GROUP BY g.genre_name
+            ORDER BY count DESC
+            LIMIT 10;
+            """,
+        ),
+    }
+    # Los resultados son listas de filas (nombre, conteo) que se pasan
+    # directamente a Plotly como listas: construir un DataFrame para ≤30
+    # filas solo añadiría inferencia de dtypes e índice sin uso. Los errores
+    # se manejan aquí, fuera de la función cacheada, para que un fallo
+    # transitorio no quede cacheado 24 horas: el próximo rerun reintenta.
+    try:
+        analysis_results = run_analysis_queries(pool, analysis_queries)
+    except Exception as e:
+        st.error(f"Error al ejecutar las consultas de análisis: {e}")
+        analysis_results = {name: [] for name in analysis_queries}
 
-    query_show_genres = "SELECT show_id, genre_id FROM show_genres;"
-    df_show_genres = run_query(conn, query_show_genres)
-    query_genres = "SELECT genre_id, genre_name FROM genres;"
-    df_genres = run_query(conn, query_genres)
+    rows_type_counts = analysis_results['type_counts']
+    rows_release_year_counts = analysis_results['release_year_counts']
+    rows_rating_counts = analysis_results['rating_counts']
+    rows_month_counts = analysis_results['month_counts']
+    rows_top_directors = analysis_results['top_directors']
+    rows_top_cast = analysis_results['top_cast']
+    rows_top_countries = analysis_results['top_countries']
+    rows_top_genres = analysis_results['top_genres']
 
 
-    if not df_shows.empty:
+    if rows_type_counts:
         # --- 1. Conteo de Tipos (Movie vs TV Show) ---
         st.subheader("Distribución por Tipo (Película / Serie de TV)")
-        type_counts = df_shows['type'].value_counts().reset_index()
-        type_counts.columns = ['type', 'count']
-        fig_type = px.pie(type_counts, names='type', values='count', title="Películas vs. Series de TV",
+        type_names, type_counts = zip(*rows_type_counts)
+        fig_type = px.pie(names=type_names, values=type_counts, title="Películas vs. Series de TV",
                           color_discrete_sequence=px.colors.qualitative.Pastel)
         st.plotly_chart(fig_type, use_container_width=True)
 
         # --- 2. Shows por Año de Lanzamiento ---
         st.subheader("Número de Shows por Año de Lanzamiento")
-        df_shows_release = df_shows.dropna(subset=['release_year'])
-        if not df_shows_release.empty:
-            df_shows_release['release_year'] = df_shows_release['release_year'].astype(int)
-            release_year_counts = df_shows_release['release_year'].value_counts().sort_index().reset_index()
-            release_year_counts.columns = ['release_year', 'count']
-            latest_years_count = release_year_counts.tail(30) 
-
-            fig_release_year = px.bar(latest_years_count, x='release_year', y='count', 
+        if rows_release_year_counts:
+            release_years, release_counts = zip(*sorted(rows_release_year_counts))
+
+            fig_release_year = px.bar(x=release_years, y=release_counts,
                                       title="Shows por Año de Lanzamiento (Últimos años)",
+                                      labels={'x': 'release_year', 'y': 'count'},
                                       color_discrete_sequence=px.colors.sequential.Viridis)
-            fig_release_year.update_xaxes(type='category') 
+            fig_release_year.update_xaxes(type='category')
             st.plotly_chart(fig_release_year, use_container_width=True)
         else:
             st.warning("No hay datos de 'release_year' para mostrar el gráfico.")
 
         # --- 3. Top Ratings ---
         st.subheader("Distribución de Ratings")
-        if 'rating' in df_shows.columns:
-            df_ratings = df_shows.dropna(subset=['rating'])
-            if not df_ratings.empty:
-                rating_counts = df_ratings['rating'].value_counts().nlargest(10).reset_index() 
-                rating_counts.columns = ['rating', 'count']
-                fig_rating = px.bar(rating_counts, x='rating', y='count', title="Top 10 Ratings más comunes",
-                                    color_discrete_sequence=px.colors.qualitative.Bold)
-                st.plotly_chart(fig_rating, use_container_width=True)
-            else:
-                st.warning("No hay datos de 'rating' para mostrar el gráfico.")
+        if rows_rating_counts:
+            ratings, rating_counts = zip(*rows_rating_counts)
+            fig_rating = px.bar(x=ratings, y=rating_counts, title="Top 10 Ratings más comunes",
+                                labels={'x': 'rating', 'y': 'count'},
+                                color_discrete_sequence=px.colors.qualitative.Bold)
+            st.plotly_chart(fig_rating, use_container_width=True)
         else:
-            st.warning("La columna 'rating' no se encontró en la tabla 'shows'.")
+            st.warning("No hay datos de 'rating' para mostrar el gráfico.")
 
         # --- 4. Shows por mes en que fueron añadidos ---
         st.subheader("Shows añadidos por Mes")
-        if 'month_added' in df_shows.columns:
-            month_map = {1: 'Ene', 2: 'Feb', 3: 'Mar', 4: 'Abr', 5: 'May', 6: 'Jun', 
+        if rows_month_counts:
+            month_map = {1: 'Ene', 2: 'Feb', 3: 'Mar', 4: 'Abr', 5: 'May', 6: 'Jun',
                          7: 'Jul', 8: 'Ago', 9: 'Sep', 10: 'Oct', 11: 'Nov', 12: 'Dic'}
-            df_shows_month = df_shows.dropna(subset=['month_added'])
-            if not df_shows_month.empty:
-                df_shows_month['month_added_name'] = df_shows_month['month_added'].astype(int).map(month_map)
-                month_added_counts = df_shows_month['month_added_name'].value_counts().reset_index()
-                month_added_counts.columns = ['month_added_name', 'count']
-                all_months_df = pd.DataFrame({'month_added_name': list(month_map.values())})
-                month_added_counts = pd.merge(all_months_df, month_added_counts, on='month_added_name', how='left').fillna(0)
-                month_order_map = {name: i for i, name in enumerate(month_map.values())}
-                month_added_counts['month_order'] = month_added_counts['month_added_name'].map(month_order_map)
-                month_added_counts = month_added_counts.sort_values('month_order')
-
-                fig_month_added = px.bar(month_added_counts, x='month_added_name', y='count', 
-                                         title="Número de Shows añadidos por Mes",
-                                         color_discrete_sequence=px.colors.qualitative.Set2)
-                st.plotly_chart(fig_month_added, use_container_width=True)
-            else:
-                st.warning("No hay datos de 'month_added' para mostrar el gráfico.")
+            # Asegurar que los 12 meses aparezcan en orden, con 0 para los meses sin datos
+            counts_by_month = {int(month): count for month, count in rows_month_counts}
+            month_names = [month_map[m] for m in range(1, 13)]
+            month_counts = [counts_by_month.get(m, 0) for m in range(1, 13)]
+
+            fig_month_added = px.bar(x=month_names, y=month_counts,
+                                     title="Número de Shows añadidos por Mes",
+                                     labels={'x': 'month_added_name', 'y': 'count'},
+                                     color_discrete_sequence=px.colors.qualitative.Set2)
+            st.plotly_chart(fig_month_added, use_container_width=True)
         else:
-            st.warning("La columna 'month_added' no se encontró en la tabla 'shows'.")
-        
+            st.warning("No hay datos de 'month_added' para mostrar el gráfico.")
+
         st.markdown("---")
         # --- 5. Top 10 Directores ---
         st.subheader("Top 10 Directores con Más Shows")
-        if not df_directors.empty and not df_shows.empty:
-            df_shows_with_directors = pd.merge(df_shows, df_directors, on='director_id', how='inner')
-            # Filtrar directores 'Unknown' antes de contar
-            df_filtered_directors = df_shows_with_directors[df_shows_with_directors['director_name'].str.lower() != 'unknown']
-            
-            if not df_filtered_directors.empty:
-                director_counts = df_filtered_directors['director_name'].value_counts().nlargest(10).reset_index()
-                director_counts.columns = ['director_name', 'count']
-                fig_directors = px.bar(director_counts, x='director_name', y='count', 
-                                       title="Top 10 Directores (excluyendo 'Unknown')", 
-                                       color='count', # Usar 'count' para el degradado
-                                       color_continuous_scale=px.colors.sequential.Plasma,
-                                       labels={'count':'Número de Shows'})
-                st.plotly_chart(fig_directors, use_container_width=True)
-            else:
-                st.warning("No hay datos de directores (después de filtrar 'Unknown') para mostrar.")
+        if rows_top_directors:
+            director_names, director_counts = zip(*rows_top_directors)
+            fig_directors = px.bar(x=director_names, y=director_counts,
+                                   title="Top 10 Directores (excluyendo 'Unknown')",
+                                   color=director_counts, # Usar el conteo para el degradado
+                                   color_continuous_scale=px.colors.sequential.Plasma,
+                                   labels={'x': 'director_name', 'y': 'Número de Shows'})
+            st.plotly_chart(fig_directors, use_container_width=True)
         else:
-            st.warning("No se pudieron cargar datos de directores o shows.")
+            st.warning("No se pudieron cargar datos de directores.")
 
         # --- 6. Top 10 Miembros del Elenco ---
         st.subheader("Top 10 Miembros del Elenco con Más Apariciones")
-        if not df_show_cast.empty and not df_cast_members.empty:
-            df_full_cast_info = pd.merge(df_show_cast, df_cast_members, on='cast_member_id', how='inner')
-            cast_counts = df_full_cast_info['cast_member_name'].value_counts().nlargest(10).reset_index()
-            cast_counts.columns = ['cast_member_name', 'count']
-            fig_cast = px.bar(cast_counts, x='cast_member_name', y='count', 
-                              title="Top 10 Miembros del Elenco", 
-                              color='count', # Usar 'count' para el degradado
+        if rows_top_cast:
+            cast_names, cast_counts = zip(*rows_top_cast)
+            fig_cast = px.bar(x=cast_names, y=cast_counts,
+                              title="Top 10 Miembros del Elenco",
+                              color=cast_counts, # Usar el conteo para el degradado
                               color_continuous_scale=px.colors.sequential.Cividis,
-                              labels={'count':'Número de Apariciones'})
+                              labels={'x': 'cast_member_name', 'y': 'Número de Apariciones'})
             st.plotly_chart(fig_cast, use_container_width=True)
         else:
             st.warning("No se pudieron cargar datos del elenco.")
 
         # --- 7. Top 10 Países Productores ---
         st.subheader("Top 10 Países Productores de Contenido")
-        if not df_show_countries.empty and not df_countries.empty:
-            df_full_country_info = pd.merge(df_show_countries, df_countries, on='country_id', how='inner')
-            country_counts = df_full_country_info['country_name'].value_counts().nlargest(10).reset_index()
-            country_counts.columns = ['country_name', 'count']
-            fig_countries = px.bar(country_counts, x='country_name', y='count',
-                                   title="Top 10 Países Productores", 
-                                   color='count', # Usar 'count' para el degradado
+        if rows_top_countries:
+            country_names, country_counts = zip(*rows_top_countries)
+            fig_countries = px.bar(x=country_names, y=country_counts,
+                                   title="Top 10 Países Productores",
+                                   color=country_counts, # Usar el conteo para el degradado
                                    color_continuous_scale=px.colors.sequential.Blues,
-                                   labels={'count':'Número de Shows'})
+                                   labels={'x': 'country_name', 'y': 'Número de Shows'})
             st.plotly_chart(fig_countries, use_container_width=True)
         else:
             st.warning("No se pudieron cargar datos de países.")
 
         # --- 8. Top 10 Géneros ---
         st.subheader("Top 10 Géneros Más Comunes")
-        if not df_show_genres.empty and not df_genres.empty:
-            df_full_genre_info = pd.merge(df_show_genres, df_genres, on='genre_id', how='inner')
-            genre_counts = df_full_genre_info['genre_name'].value_counts().nlargest(10).reset_index()
-            genre_counts.columns = ['genre_name', 'count']
-            fig_genres = px.bar(genre_counts, x='genre_name', y='count',
-                                title="Top 10 Géneros", 
-                                color='count', # Usar 'count' para el degradado
+        if rows_top_genres:
+            genre_names, genre_counts = zip(*rows_top_genres)
+            fig_genres = px.bar(x=genre_names, y=genre_counts,
+                                title="Top 10 Géneros",
+                                color=genre_counts, # Usar el conteo para el degradado
                                 color_continuous_scale=px.colors.sequential.Greens,
-                                labels={'count':'Número de Shows'})
+                                labels={'x': 'genre_name', 'y': 'Número de Shows'})
             st.plotly_chart(fig_genres, use_container_width=True)
         else:
             st.warning("No se pudieron cargar datos de géneros.")
@@ -355,13 +606,38 @@ elif option == "Buscar Shows por Título":
     search_term = st.text_input("Ingresa parte del título a buscar:", "")
 
     if search_term:
-        query_search = "SELECT show_id, type, title, release_year, rating, description FROM shows WHERE title ILIKE %s;"
+        # El ILIKE sin ancla usa el índice GIN de trigramas sobre shows.title
+        # (ver sql/indexes.sql); sin él, cada búsqueda escanea toda la tabla.
+        # LIMIT 500 acota el resultado de búsquedas muy genéricas, y el backend
+        # pyarrow evita un objeto de Python por cadena en las columnas de texto.
+        # La columna description (la más pesada en bytes) no se descarga aquí:
+        # se carga bajo demanda para el show que el usuario elija.
+        SEARCH_LIMIT = 500
+        query_search = "SELECT show_id, type, title, release_year, rating FROM shows WHERE title ILIKE %s LIMIT %s;"
         try:
-            df_search_results = run_query(conn, query_search, params=(f"%{search_term}%",))
+            df_search_results = run_query(pool, query_search,
+                                          params=(f"%{search_term}%", SEARCH_LIMIT),
+                                          dtype_backend="pyarrow")
 
             if not df_search_results.empty:
                 st.subheader(f"Resultados para '{search_term}':")
                 st.dataframe(df_search_results, use_container_width=True)
+                if len(df_search_results) == SEARCH_LIMIT:
+                    st.caption(f"Mostrando las primeras {SEARCH_LIMIT} coincidencias; refina la búsqueda para ver menos resultados.")
+
+                titles_by_id = dict(zip(df_search_results['show_id'], df_search_results['title']))
+                selected_show_id = st.selectbox(
+                    "Ver descripción de:",
+                    options=list(titles_by_id),
+                    format_func=titles_by_id.get
+                )
+                if selected_show_id is not None:
+                    df_description = run_query(pool, "SELECT description FROM shows WHERE show_id = %s;",
+                                               params=(selected_show_id,))
+                    if not df_description.empty and pd.notna(df_description.iloc[0, 0]):
+                        st.info(df_description.iloc[0, 0])
+                    else:
+                        st.info("Este show no tiene descripción.")
             else:
                 st.info(f"No se encontraron shows que coincidan con '{search_term}'.")
         except Exception as e: 
@@ -0,0 +1,80 @@
+-- Vistas materializadas para la vista "Análisis de Shows" del dashboard.
+-- Pre-calculan los agregados sobre shows y sus tablas de relación, de modo
+-- que el dashboard solo lee 10-30 filas por gráfico en lugar de re-escanear
+-- las tablas base en cada expiración de caché.
+--
+-- Ejecutar una vez sobre la base de datos:
+--   psql -h $DB_HOST -U $DB_USER -d $DB_NAME -f sql/analytics_views.sql
+--
+-- Refrescar cada noche (cron o pg_cron); los índices únicos permiten
+-- REFRESH MATERIALIZED VIEW CONCURRENTLY sin bloquear las lecturas:
+--   REFRESH MATERIALIZED VIEW CONCURRENTLY mv_type_counts;
+--   (ídem para el resto de vistas)
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_type_counts AS
+SELECT type, COUNT(*) AS count
+FROM shows
+GROUP BY type;
+CREATE UNIQUE INDEX IF NOT EXISTS mv_type_counts_key ON mv_type_counts (type);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_release_year_counts AS
+SELECT release_year, COUNT(*) AS count
+FROM shows
+WHERE release_year IS NOT NULL
+GROUP BY release_year
+ORDER BY release_year DESC
+LIMIT 30;
+CREATE UNIQUE INDEX IF NOT EXISTS mv_release_year_counts_key ON mv_release_year_counts (release_year);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_rating_counts AS
+SELECT rating, COUNT(*) AS count
+FROM shows
+WHERE rating IS NOT NULL
+GROUP BY rating
+ORDER BY count DESC
+LIMIT 10;
+CREATE UNIQUE INDEX IF NOT EXISTS mv_rating_counts_key ON mv_rating_counts (rating);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_month_counts AS
+SELECT month_added, COUNT(*) AS count
+FROM shows
+WHERE month_added IS NOT NULL
+GROUP BY month_added;
+CREATE UNIQUE INDEX IF NOT EXISTS mv_month_counts_key ON mv_month_counts (month_added);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_top_directors AS
+SELECT d.director_name, COUNT(*) AS count
+FROM shows s
+JOIN directors d USING (director_id)
+WHERE lower(d.director_name) <> 'unknown'
+GROUP BY d.director_name
+ORDER BY count DESC
+LIMIT 10;
+CREATE UNIQUE INDEX IF NOT EXISTS mv_top_directors_key ON mv_top_directors (director_name);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_top_cast AS
+SELECT cm.cast_member_name, COUNT(*) AS count
+FROM show_cast_members scm
+JOIN cast_members cm USING (cast_member_id)
+GROUP BY cm.cast_member_name
+ORDER BY count DESC
+LIMIT 10;
+CREATE UNIQUE INDEX IF NOT EXISTS mv_top_cast_key ON mv_top_cast (cast_member_name);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_top_countries AS
+SELECT c.country_name, COUNT(*) AS count
+FROM show_countries sc
+JOIN countries c USING (country_id)
+GROUP BY c.country_name
+ORDER BY count DESC
+LIMIT 10;
+CREATE UNIQUE INDEX IF NOT EXISTS mv_top_countries_key ON mv_top_countries (country_name);
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_top_genres AS
+SELECT g.genre_name, COUNT(*) AS count
+FROM show_genres sg
+JOIN genres g USING (genre_id)
+GROUP BY g.genre_name
+ORDER BY count DESC
+LIMIT 10;
+CREATE UNIQUE INDEX IF NOT EXISTS mv_top_genres_key ON mv_top_genres (genre_name);
@@ -0,0 +1,26 @@
+-- Índices para acelerar las consultas del dashboard.
+--
+-- Ejecutar una vez sobre la base de datos:
+--   psql -h $DB_HOST -U $DB_USER -d $DB_NAME -f sql/indexes.sql
+-- (CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción;
+-- ejecutar este archivo fuera de un bloque BEGIN/COMMIT.)
+
+-- Búsqueda por título: "WHERE title ILIKE '%...%'" es un patrón sin ancla
+-- que fuerza un escaneo secuencial de toda la tabla shows. Con un índice
+-- GIN de trigramas PostgreSQL resuelve el ILIKE por índice.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS shows_title_trgm ON shows USING gin (title gin_trgm_ops);
+
+-- Consulta rápida "Shows Añadidos por Año": índice B-tree sobre year_added
+-- para que el filtro de igualdad no escanee toda la tabla.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS shows_year_added_idx ON shows (year_added);
+
+-- Agregados del análisis: release_year y month_added son enteros de baja
+-- cardinalidad y aproximadamente monótonos por bloques, el caso ideal para
+-- índices BRIN (por rango de bloques), que ocupan ~0.1% de un B-tree y
+-- aceleran los escaneos de rango/igualdad de los GROUP BY.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS shows_release_year_brin ON shows USING BRIN (release_year) WITH (pages_per_range = 32);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS shows_month_added_brin ON shows USING BRIN (month_added) WITH (pages_per_range = 32);
+
+-- Actualizar estadísticas para que el planificador considere los índices nuevos.
+ANALYZE shows;